@@ -3,12 +3,354 @@ TRUTH-AI - Gemini Integration Module
 AI-powered misinformation detection with educational insights + verification links
 """
 
+import asyncio
+import copy
+import hashlib
+import io
 import os
-import google.generativeai as genai
-import streamlit as st
-from typing import Dict, Optional
+import functools
+import re
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
 import json
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+from cachetools import TTLCache
+
+# google.generativeai is imported on first use; Streamlit is optional so the analyzer also runs from scripts
+try:
+    import streamlit as st
+except ImportError:
+    st = None
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+
+def _notify_error(message: str):
+    if st:
+        st.error(message)
+    else:
+        print(message)
+
+
+def _notify_warning(message: str):
+    if st:
+        st.warning(message)
+    else:
+        print(message)
+
+
+def _get_secret(name: str) -> Optional[str]:
+    return os.getenv(name) or (st.secrets.get(name) if st else None)
+
+
+@functools.lru_cache(maxsize=None)
+def _api_errors() -> Tuple[type, ...]:
+    """
+    Failures expected from a Gemini request, resolved lazily with the SDK. Anything else is a bug and propagates.
+    """
+    from google.api_core.exceptions import GoogleAPIError
+    from google.generativeai.types import BlockedPromptException, StopCandidateException
+
+    # OSError covers network failures and timeouts; ValueError covers blocked or empty responses and bad JSON
+    return GoogleAPIError, BlockedPromptException, StopCandidateException, OSError, ValueError
+
+
+def _error_message(e: Exception) -> str:
+    # API errors carry a short message; str() on them also renders the error detail payload
+    return getattr(e, "message", None) or str(e)
+
+
+_configured_api_key = None
+_configure_lock = threading.Lock()
+
+
+def _configure_genai(api_key: str):
+    """
+    Configure the SDK only when the key changes, genai.configure drops the pooled client channels
+    """
+    global _configured_api_key
+    import google.generativeai as genai
+
+    with _configure_lock:
+        if api_key != _configured_api_key:
+            genai.configure(api_key=api_key)
+            _configured_api_key = api_key
+    return genai
+
+
+@functools.lru_cache(maxsize=4)
+def _get_model(api_key: str, name: str, system_instruction: Optional[str] = None):
+    """
+    Build each GenerativeModel once per process instead of once per analyzer
+    """
+    return _configure_genai(api_key).GenerativeModel(name, system_instruction=system_instruction)
+
+
+def _cache_resource(func):
+    return st.cache_resource(show_spinner=False)(func) if st else functools.lru_cache(maxsize=None)(func)
+
+
+def _json_loads(data: str):
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either one
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def _json_dumps_pretty(data) -> str:
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2)
+
+
+_MODEL_NAME = "gemini-2.0-flash"
+
+T = TypeVar("T")
+
+_RISK_COLORS = {"LOW": "#28a745", "MEDIUM": "#ffc107", "HIGH": "#dc3545"}
+_VALID_RISK = frozenset(_RISK_COLORS)
+_VALID_PRED = frozenset({"REAL", "LIKELY_REAL", "UNCERTAIN", "LIKELY_FAKE", "FAKE"})
+
+# Confidence display buckets, checked from the highest threshold down
+_CONF_BUCKETS = ((80, "🔴 High"), (60, "🟡 Medium"), (float("-inf"), "🟢 Low"))
+
+# Analyses of identical input are reused for a day, in memory and on disk across restarts
+_CACHE_TTL = 24 * 3600
+_DISK_CACHE_DIR = ".gemini_cache"
+
+_SUSPICIOUS_PHRASES = (
+    "unnamed sources", "officials refuse to comment", "shocking discovery",
+    "they don't want you to know", "viral post", "share before it's deleted"
+)
+_SUSPICIOUS_RE = re.compile("|".join(re.escape(p) for p in _SUSPICIOUS_PHRASES), re.IGNORECASE)
+
+
+def _compile_phrase_db():
+    """
+    Compile the phrases into a Hyperscan DFA database when the library is installed
+    """
+    if hyperscan is None:
+        return None
+    count = len(_SUSPICIOUS_PHRASES)
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[re.escape(p).encode() for p in _SUSPICIOUS_PHRASES],
+        ids=list(range(count)),
+        elements=count,
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * count
+    )
+    return db
+
+
+_SUSPICIOUS_DB = _compile_phrase_db()
+# A Hyperscan database owns a single scratch space, so scans from concurrent sessions are serialized
+_SUSPICIOUS_DB_LOCK = threading.Lock()
+
+
+def _find_suspicious_phrases(text: str) -> set:
+    """
+    Return the suspicious phrases contained in text, scanning it in a single pass
+    """
+    if _SUSPICIOUS_DB is None:
+        return {match.group(0).lower() for match in _SUSPICIOUS_RE.finditer(text)}
+
+    matched_ids = []
+    with _SUSPICIOUS_DB_LOCK:
+        _SUSPICIOUS_DB.scan(text.encode(), match_event_handler=lambda pid, *_: matched_ids.append(pid))
+    return {_SUSPICIOUS_PHRASES[pid] for pid in matched_ids}
+
+# From the first "{" to the last "}" of a response
+_JSON_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+# String fields whose closing quote has already arrived in a partially streamed response
+_PARTIAL_FIELD_RE = re.compile(
+    r'"(risk_level|prediction|summary|detailed_breakdown|context_analysis)"\s*:\s*"((?:[^"\\]|\\.)*)"'
+)
+
+# Fixed instructions for single-text analysis, sent once per model as the system instruction
+_SYSTEM_INSTRUCTION = """
+You are an expert misinformation detection analyst. Analyze the text you are given for potential misinformation and provide educational insights.
+The message may also carry the prediction of our ML model as context.
+
+Please provide your analysis in this exact JSON format (valid JSON only, avoid commentary outside JSON):
+{
+    "confidence_score": [number from 0-100],
+    "risk_level": "[LOW/MEDIUM/HIGH]",
+    "prediction": "[REAL/LIKELY_REAL/UNCERTAIN/LIKELY_FAKE/FAKE]",
+    "red_flags": [
+      {
+        "flag": "specific red flag detected",
+        "explanation": "why this is concerning",
+        "severity": "[LOW/MEDIUM/HIGH]"
+      }
+    ],
+    "credibility_indicators": [
+      {
+        "indicator": "positive or negative indicator",
+        "type": "[POSITIVE/NEGATIVE]",
+        "explanation": "what this means"
+      }
+    ],
+    "educational_insights": [
+        "Key learning point 1",
+        "Key learning point 2"
+    ],
+    "verification_suggestions": [
+        "How to fact-check this type of content",
+        "What sources to consult"
+    ],
+    "verification_links": [
+      {
+        "title": "Short descriptive title",
+        "url": "https://example.com/source-article",
+        "type": "[OFFICIAL_SITE/NEWS/RESEARCH/FACTCHECK]",
+        "note": "one-line reason why this link is relevant"
+      }
+    ],
+    "verification_notes": "Short instructions on how to verify, or summary of key linked sources",
+    "summary": "Brief explanation of why this content is likely real or fake",
+    "detailed_breakdown": "Specific analysis of why this might be real or fake: language patterns, credibility indicators",
+    "context_analysis": "What readers should look for in similar articles"
+}
+
+IMPORTANT:
+- Prefer authoritative sources for links (official agency sites, major news orgs, academic journals, recognized fact-checkers).
+- Provide up to 5 verification links, each with title, url, type and a one-line note.
+- If you cannot find direct sources, return an empty array for verification_links and explain which credible sources to check in verification_notes.
+- Keep all output strictly valid JSON; do not include text before/after the JSON object.
+"""
+
+# Part of every cache key, bump when the response schema above changes so old entries are not reused
+_RESPONSE_SCHEMA_VERSION = 2
+
+_PROMPT_TEMPLATE = """
+{context}
+
+Text to analyze: "{text}"
+"""
+
+# Static parts of the offline responses; immutable so they can be shared between responses
+_FALLBACK_RESPONSE = {
+    "confidence_score": 50,
+    "risk_level": "MEDIUM",
+    "prediction": "UNCERTAIN",
+    "educational_insights": (
+        "Always verify information from multiple sources",
+        "Look for official confirmations and press releases"
+    ),
+    "verification_suggestions": (
+        "Check the original source of the information",
+        "Look for corroboration from reliable news outlets"
+    ),
+    "verification_notes": "",
+    "summary": "AI analysis temporarily unavailable. Please verify manually.",
+    "detailed_breakdown": "",
+    "context_analysis": "",
+    "fallback": True
+}
+
+_TEXT_RESPONSE_INSIGHTS = (
+    "Look for specific sources and official confirmation",
+    "Be skeptical of sensational claims",
+    "Cross-reference with multiple reliable sources"
+)
+_TEXT_RESPONSE_SUGGESTIONS = (
+    "Check official websites and press releases",
+    "Look for reporting by established news organizations"
+)
+
+# Single background worker for disk cache writes, keeping them off the request path and in order
+_DISK_WRITER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gemini-cache-writer")
+
+# In-process memo in front of the disk cache, a refresh overwrites the entry so every path sees the new result
+_MEMO = TTLCache(maxsize=10_000, ttl=_CACHE_TTL)
+_MEMO_LOCK = threading.Lock()
+
+# Upper bound on texts packed into one batch prompt, keeps requests well inside the context window
+_MAX_BATCH_SIZE = 10
+
+
+class _RateLimiter:
+    """
+    Token bucket throttling Gemini calls to the configured requests and tokens per minute
+    """
+
+    def __init__(self, rpm: int, tpm: int):
+        self.max_requests = float(rpm)
+        self.max_tokens = float(tpm)
+        self.available_requests = self.max_requests
+        self.available_tokens = self.max_tokens
+        self.last_update = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, requests: int, tokens: int) -> float:
+        """
+        Take capacity from the bucket, or return how many seconds to wait before retrying
+        """
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self.last_update
+            self.last_update = now
+            self.available_requests = min(self.max_requests, self.available_requests + elapsed * self.max_requests / 60)
+            self.available_tokens = min(self.max_tokens, self.available_tokens + elapsed * self.max_tokens / 60)
+
+            # A single prompt larger than the whole budget only has to wait for a full bucket
+            tokens = min(tokens, self.max_tokens)
+            if self.available_requests >= requests and self.available_tokens >= tokens:
+                self.available_requests -= requests
+                self.available_tokens -= tokens
+                return 0.0
+
+            missing_requests = max(0.0, requests - self.available_requests)
+            missing_tokens = max(0.0, tokens - self.available_tokens)
+            return max(missing_requests * 60 / self.max_requests, missing_tokens * 60 / self.max_tokens)
+
+    def acquire_sync(self, requests: int = 1, tokens: int = 0):
+        while (wait := self._reserve(requests, tokens)) > 0:
+            time.sleep(wait)
+
+    async def acquire(self, requests: int = 1, tokens: int = 0):
+        while (wait := self._reserve(requests, tokens)) > 0:
+            await asyncio.sleep(wait)
+
+
+def _positive_int_env(name: str, default: int) -> int:
+    """
+    Read a positive integer from the environment, falling back to the default on missing or bad values
+    """
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        parsed = int(value)
+    except ValueError:
+        parsed = 0
+    if parsed <= 0:
+        print(f"⚠️ Ignoring invalid {name}={value!r}, using {default}")
+        return default
+    return parsed
+
+
+def _estimate_tokens(prompt: str) -> int:
+    return len(prompt) // 4
 
 
 class GeminiAnalyzer:
@@ -20,131 +362,342 @@ class GeminiAnalyzer:
         """
         Initialize Gemini AI client
         """
-        self.api_key = api_key or os.getenv('GEMINI_API_KEY') or st.secrets.get('GEMINI_API_KEY')
+        self.api_key = api_key or _get_secret('GEMINI_API_KEY')
+        self.is_configured = False
+        self._rate_limiter = _RateLimiter(
+            rpm=_positive_int_env("GEMINI_RPM", 60),
+            tpm=_positive_int_env("GEMINI_TPM", 1_000_000)
+        )
 
         if not self.api_key:
-            st.error("❌ Gemini API key not found! Please set GEMINI_API_KEY in environment variables.")
+            _notify_error("❌ Gemini API key not found! Please set GEMINI_API_KEY in environment variables.")
             return
 
         try:
-            genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel('gemini-2.0-flash')
+            self.model = _get_model(self.api_key, _MODEL_NAME)
+            self._analysis_model = _get_model(self.api_key, _MODEL_NAME, _SYSTEM_INSTRUCTION)
             self.is_configured = True
             print("✅ Successfully initialized Gemini 2.0 Flash model")
         except Exception as e:
-            st.error(f"❌ Failed to configure Gemini AI: {str(e)}")
+            _notify_error(f"❌ Failed to configure Gemini AI: {str(e)}")
             self.is_configured = False
 
-    def analyze_text(self, text: str, ml_prediction: str = None) -> Dict:
+    def analyze_text(self, text: str, ml_prediction: str = None, use_cache: bool = True,
+                     on_partial: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """
+        Analyze text for misinformation using Gemini AI, reusing cached results for identical input.
+        While the response streams in, on_partial receives the fields that are already complete.
+        """
+        if not self.is_configured:
+            return self._get_fallback_response()
+
+        try:
+            key = _content_key(text, ml_prediction)
+            if use_cache:
+                cached = _load_result(key)
+                if cached is not None:
+                    return cached
+            return _store_result(key, self._request_analysis(text, ml_prediction, on_partial))
+
+        except _api_errors() as e:
+            _notify_error(f"⚠️ Gemini API error: {_error_message(e)}")
+            return self._get_fallback_response()
+
+    def _request_analysis(self, text: str, ml_prediction: str = None,
+                          on_partial: Optional[Callable[[Dict], None]] = None) -> Dict:
         """
-        Analyze text for misinformation using Gemini AI
+        Call Gemini for a single text, raising on API errors so that failures are never cached
+        """
+        prompt = self._create_analysis_prompt(text, ml_prediction)
+        self._rate_limiter.acquire_sync(tokens=_estimate_tokens(_SYSTEM_INSTRUCTION + prompt))
+        response_text = self._stream_response(prompt, on_partial)
+
+        if not response_text:
+            raise ValueError("Empty response from Gemini")
+        result = self._parse_gemini_response(response_text)
+        if result.get("fallback"):
+            raise ValueError("Unusable response from Gemini")
+        return result
+
+    def _stream_response(self, prompt: str, on_partial: Optional[Callable[[Dict], None]] = None) -> str:
+        """
+        Stream the generation, stopping as soon as a complete JSON object has arrived
+        """
+        buffer = ""
+        for chunk in self._analysis_model.generate_content(prompt, stream=True):
+            try:
+                chunk_text = chunk.text
+            except ValueError:
+                # Chunks without text parts (e.g. the final finish_reason chunk)
+                continue
+            buffer += chunk_text
+
+            if on_partial:
+                fields = _partial_fields(buffer)
+                if fields:
+                    on_partial(fields)
+
+            if "}" in chunk_text:
+                try:
+                    if self._extract_json(buffer) is not None:
+                        break
+                except json.JSONDecodeError:
+                    pass
+        return buffer
+
+    async def analyze_text_async(self, text: str, ml_prediction: str = None, use_cache: bool = False) -> Dict:
+        """
+        Async variant of analyze_text, the blocking SDK call runs in a worker thread
         """
         if not self.is_configured:
             return self._get_fallback_response()
 
         try:
+            key = _content_key(text, ml_prediction)
+            if use_cache:
+                cached = _load_result(key)
+                if cached is not None:
+                    return cached
+
             prompt = self._create_analysis_prompt(text, ml_prediction)
-            response = self.model.generate_content(prompt)
+            await self._rate_limiter.acquire(tokens=_estimate_tokens(_SYSTEM_INSTRUCTION + prompt))
+            response = await asyncio.to_thread(self._analysis_model.generate_content, prompt)
 
             if response and response.text:
-                return self._parse_gemini_response(response.text)
+                return _store_result(key, self._parse_gemini_response(response.text))
             else:
                 return self._get_fallback_response()
 
-        except Exception as e:
-            st.error(f"⚠️ Gemini API error: {str(e)}")
+        except _api_errors() as e:
+            _notify_error(f"⚠️ Gemini API error: {_error_message(e)}")
             return self._get_fallback_response()
 
+    def analyze_all(self, text: str, ml_prediction: Optional[str] = None, use_cache: bool = True,
+                    on_partial: Optional[Callable[[Dict], None]] = None) -> Tuple[Dict, Dict]:
+        """
+        One Gemini call for both views: the full analysis and the enhanced-analysis summary
+        (breakdown, educational insights and context) derived from the same JSON response.
+        on_partial previews completed fields while the response streams, as in analyze_text.
+        """
+        results = self.analyze_text(text, ml_prediction, use_cache=use_cache, on_partial=on_partial)
+        return results, _enhanced_view(results)
+
+    async def analyze_text_speculative(self, text: str) -> Dict:
+        """
+        Start the Gemini analysis without an ML label so it can overlap with local model inference
+        """
+        return await self.analyze_text_async(text)
+
+    def analyze_alongside(self, text: str, predict: Callable[[], T]) -> Tuple[Dict, T]:
+        """
+        Run the speculative Gemini analysis while `predict` runs in a worker thread,
+        so the total latency is the slower of the two rather than their sum
+        """
+        async def _run():
+            gemini_task = asyncio.ensure_future(self.analyze_text_speculative(text))
+            ml_result = await asyncio.to_thread(predict)
+            return await gemini_task, ml_result
+
+        return asyncio.run(_run())
+
+    async def analyze_many_async(self, texts: List[str], ml_predictions: Optional[List[str]] = None,
+                                 concurrency: int = 10) -> List[Dict]:
+        """
+        Analyze texts concurrently, keeping at most `concurrency` Gemini requests in flight.
+        Texts that only differ in case or whitespace are sent once and the result is shared.
+        """
+        if ml_predictions is None:
+            ml_predictions = [None] * len(texts)
+
+        buckets = {}
+        for i, (text, ml_prediction) in enumerate(zip(texts, ml_predictions)):
+            buckets.setdefault(_dedup_key(text, ml_prediction), []).append(i)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _bounded(text: str, ml_prediction: Optional[str]) -> Dict:
+            async with semaphore:
+                return await self.analyze_text_async(text, ml_prediction)
+
+        indices = list(buckets.values())
+        unique_results = await asyncio.gather(
+            *(_bounded(texts[group[0]], ml_predictions[group[0]]) for group in indices)
+        )
+
+        results = [None] * len(texts)
+        for group, result in zip(indices, unique_results):
+            results[group[0]] = result
+            for i in group[1:]:
+                results[i] = copy.deepcopy(result)
+        return results
+
+    def analyze_many(self, texts: List[str], ml_predictions: Optional[List[str]] = None,
+                     concurrency: int = 10) -> List[Dict]:
+        """
+        Blocking wrapper around analyze_many_async
+        """
+        return asyncio.run(self.analyze_many_async(texts, ml_predictions, concurrency))
+
+    def analyze_texts(self, texts: List[str], ml_predictions: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Analyze several texts using one Gemini request per batch of up to _MAX_BATCH_SIZE texts
+        """
+        if ml_predictions is None:
+            ml_predictions = [None] * len(texts)
+
+        if not self.is_configured:
+            return [self._get_fallback_response() for _ in texts]
+
+        results = []
+        for start in range(0, len(texts), _MAX_BATCH_SIZE):
+            batch = texts[start:start + _MAX_BATCH_SIZE]
+            predictions = ml_predictions[start:start + _MAX_BATCH_SIZE]
+            try:
+                prompt = self._create_batch_prompt(batch, predictions)
+                self._rate_limiter.acquire_sync(tokens=_estimate_tokens(prompt))
+                response = self.model.generate_content(prompt)
+
+                if response and response.text:
+                    results.extend(self._parse_batch_response(response.text, len(batch)))
+                else:
+                    results.extend(self._get_fallback_response() for _ in batch)
+
+            except _api_errors() as e:
+                _notify_error(f"⚠️ Gemini API error: {_error_message(e)}")
+                results.extend(self._get_fallback_response() for _ in batch)
+
+        return results
+
     def _create_analysis_prompt(self, text: str, ml_prediction: str = None) -> str:
         """
         Create detailed prompt for Gemini AI analysis (extended to request verification links)
         """
         context = f"ML Model Prediction: {ml_prediction}" if ml_prediction else ""
+        return _PROMPT_TEMPLATE.format(context=context, text=text)
 
-        prompt = f"""
-        You are an expert misinformation detection analyst. Analyze the following text for potential misinformation and provide educational insights.
+    def _create_batch_prompt(self, texts: List[str], ml_predictions: List[Optional[str]]) -> str:
+        """
+        Create a single prompt covering several texts, answered as one JSON results array
+        """
+        items = json.dumps(
+            [
+                {"id": i, "ml_prediction": prediction, "text": text}
+                for i, (text, prediction) in enumerate(zip(texts, ml_predictions))
+            ],
+            ensure_ascii=False
+        )
 
-        {context}
+        prompt = f"""
+        You are an expert misinformation detection analyst. Analyze each of the following items for potential misinformation and provide educational insights.
+        Each item has an "id", the text to analyze and, when available, the prediction of our ML model.
 
-        Text to analyze: "{text}"
+        Items: {items}
 
         Please provide your analysis in this exact JSON format (valid JSON only, avoid commentary outside JSON):
         {{
-            "confidence_score": [number from 0-100],
-            "risk_level": "[LOW/MEDIUM/HIGH]",
-            "prediction": "[REAL/LIKELY_REAL/UNCERTAIN/LIKELY_FAKE/FAKE]",
-            "red_flags": [
-              {{
-                "flag": "specific red flag detected",
-                "explanation": "why this is concerning",
-                "severity": "[LOW/MEDIUM/HIGH]"
-              }}
-            ],
-            "credibility_indicators": [
-              {{
-                "indicator": "positive or negative indicator",
-                "type": "[POSITIVE/NEGATIVE]",
-                "explanation": "what this means"
-              }}
-            ],
-            "educational_insights": [
-                "Key learning point 1",
-                "Key learning point 2"
-            ],
-            "verification_suggestions": [
-                "How to fact-check this type of content",
-                "What sources to consult"
-            ],
-            "verification_links": [
+            "results": [
               {{
-                "title": "Short descriptive title",
-                "url": "https://example.com/source-article",
-                "type": "[OFFICIAL_SITE/NEWS/RESEARCH/FACTCHECK]",
-                "note": "one-line reason why this link is relevant"
+                "id": [id of the analyzed item],
+                "confidence_score": [number from 0-100],
+                "risk_level": "[LOW/MEDIUM/HIGH]",
+                "prediction": "[REAL/LIKELY_REAL/UNCERTAIN/LIKELY_FAKE/FAKE]",
+                "red_flags": [{{"flag": "...", "explanation": "...", "severity": "[LOW/MEDIUM/HIGH]"}}],
+                "credibility_indicators": [{{"indicator": "...", "type": "[POSITIVE/NEGATIVE]", "explanation": "..."}}],
+                "educational_insights": ["Key learning point"],
+                "verification_suggestions": ["How to fact-check this type of content"],
+                "verification_links": [{{"title": "...", "url": "https://...", "type": "[OFFICIAL_SITE/NEWS/RESEARCH/FACTCHECK]", "note": "..."}}],
+                "verification_notes": "Short instructions on how to verify",
+                "summary": "Brief explanation of why this content is likely real or fake"
               }}
-            ],
-            "verification_notes": "Short instructions on how to verify, or summary of key linked sources",
-            "summary": "Brief explanation of why this content is likely real or fake"
+            ]
         }}
 
         IMPORTANT:
-        - Prefer authoritative sources for links (official agency sites, major news orgs, academic journals, recognized fact-checkers).
-        - Provide up to 5 verification links, each with title, url, type and a one-line note.
-        - If you cannot find direct sources, return an empty array for verification_links and explain which credible sources to check in verification_notes.
+        - Return exactly one result per item, with the matching id.
+        - Provide up to 5 verification links per item from authoritative sources, or an empty array if you cannot find direct sources.
         - Keep all output strictly valid JSON; do not include text before/after the JSON object.
         """
         return prompt
 
+    @staticmethod
+    def _extract_json(response_text: str):
+        """
+        Decode the outermost JSON object in a response, None if it contains no object
+        """
+        match = _JSON_RE.search(response_text)
+        if match is None:
+            return None
+
+        if ijson:
+            # Stream-parse from the first brace and stop as soon as the object closes
+            try:
+                buffer = io.BytesIO(response_text[match.start():].encode())
+                return next(ijson.items(buffer, "", use_float=True))
+            except (ijson.JSONError, StopIteration):
+                pass
+
+        return _json_loads(match.group(0))
+
     def _parse_gemini_response(self, response_text: str) -> Dict:
         """
         Parse Gemini response and extract structured data
         """
         try:
-            response_text = response_text.strip()
-            start_idx = response_text.find('{')
-            end_idx = response_text.rfind('}') + 1
+            parsed_data = self._extract_json(response_text)
 
-            if start_idx != -1 and end_idx != 0:
-                json_str = response_text[start_idx:end_idx]
-                parsed_data = json.loads(json_str)
+            if parsed_data is not None:
                 return self._validate_response_data(parsed_data)
             else:
-                return self._create_response_from_text(response_text)
+                return self._create_response_from_text(response_text.strip())
 
         except json.JSONDecodeError:
             return self._create_response_from_text(response_text)
-        except Exception as e:
-            st.warning(f"⚠️ Error parsing Gemini response: {str(e)}")
+        except (AttributeError, TypeError) as e:
+            # Valid JSON of the wrong shape, e.g. a list or null where an object or string belongs
+            _notify_warning(f"⚠️ Error parsing Gemini response: {_error_message(e)}")
             return self._get_fallback_response()
 
+    def _parse_batch_response(self, response_text: str, count: int) -> List[Dict]:
+        """
+        Parse a batch response into one result per item, falling back per item on malformed entries
+        """
+        try:
+            parsed_data = self._extract_json(response_text)
+        except json.JSONDecodeError:
+            parsed_data = None
+
+        items = parsed_data.get("results", []) if isinstance(parsed_data, dict) else []
+        by_id = {}
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            # The model sometimes echoes ids as strings ("0"), which must still line up with the texts
+            try:
+                by_id[int(item.get("id"))] = item
+            except (TypeError, ValueError):
+                continue
+        if not by_id:
+            _notify_warning(f"⚠️ Gemini batch response had no usable items, using fallbacks for {count} texts")
+
+        results = []
+        for i in range(count):
+            item = by_id.get(i)
+            try:
+                results.append(self._validate_response_data(item) if item else self._get_fallback_response())
+            except (AttributeError, TypeError):
+                results.append(self._get_fallback_response())
+        return results
+
     def _validate_response_data(self, data: Dict) -> Dict:
         """
         Validate and ensure response data has required fields (now supports verification_links)
         """
+        risk_level = data.get("risk_level", "MEDIUM").upper()
+        prediction = data.get("prediction", "UNCERTAIN").upper()
         validated = {
             "confidence_score": min(100, max(0, data.get("confidence_score", 75))),
-            "risk_level": data.get("risk_level", "MEDIUM").upper(),
-            "prediction": data.get("prediction", "UNCERTAIN").upper(),
+            "risk_level": risk_level if risk_level in _VALID_RISK else "MEDIUM",
+            "prediction": prediction if prediction in _VALID_PRED else "UNCERTAIN",
             "red_flags": data.get("red_flags", []),
             "credibility_indicators": data.get("credibility_indicators", []),
             "educational_insights": data.get("educational_insights", []),
@@ -152,12 +705,11 @@ class GeminiAnalyzer:
             "verification_links": data.get("verification_links", []),
             "verification_notes": data.get("verification_notes", ""),
             "summary": data.get("summary", "Analysis completed with moderate confidence."),
+            "detailed_breakdown": data.get("detailed_breakdown", ""),
+            "context_analysis": data.get("context_analysis", ""),
             "analysis_timestamp": time.time()
         }
 
-        if validated["risk_level"] not in ["LOW", "MEDIUM", "HIGH"]:
-            validated["risk_level"] = "MEDIUM"
-
         if isinstance(validated["verification_links"], list):
             sanitized_links = []
             for link in validated["verification_links"][:5]:
@@ -178,14 +730,11 @@ class GeminiAnalyzer:
         """
         confidence = 70
         risk_level = "MEDIUM"
-        suspicious_phrases = [
-            "unnamed sources", "officials refuse to comment", "shocking discovery",
-            "they don't want you to know", "viral post", "share before it's deleted"
-        ]
+        found = _find_suspicious_phrases(text)
 
         red_flags = []
-        for phrase in suspicious_phrases:
-            if phrase.lower() in text.lower():
+        for phrase in _SUSPICIOUS_PHRASES:
+            if phrase in found:
                 red_flags.append({
                     "flag": f"Contains suspicious phrase: '{phrase}'",
                     "explanation": "This type of language is often used in misinformation",
@@ -200,18 +749,13 @@ class GeminiAnalyzer:
             "prediction": "LIKELY_FAKE" if risk_level == "HIGH" else "UNCERTAIN",
             "red_flags": red_flags,
             "credibility_indicators": [],
-            "educational_insights": [
-                "Look for specific sources and official confirmation",
-                "Be skeptical of sensational claims",
-                "Cross-reference with multiple reliable sources"
-            ],
-            "verification_suggestions": [
-                "Check official websites and press releases",
-                "Look for reporting by established news organizations"
-            ],
+            "educational_insights": _TEXT_RESPONSE_INSIGHTS,
+            "verification_suggestions": _TEXT_RESPONSE_SUGGESTIONS,
             "verification_links": [],
             "verification_notes": "",
             "summary": text[:200] + "..." if len(text) > 200 else text,
+            "detailed_breakdown": "",
+            "context_analysis": "",
             "analysis_timestamp": time.time()
         }
 
@@ -220,40 +764,122 @@ class GeminiAnalyzer:
         Provide fallback response when Gemini is unavailable
         """
         return {
-            "confidence_score": 50,
-            "risk_level": "MEDIUM",
-            "prediction": "UNCERTAIN",
+            **_FALLBACK_RESPONSE,
             "red_flags": [],
             "credibility_indicators": [],
-            "educational_insights": [
-                "Always verify information from multiple sources",
-                "Look for official confirmations and press releases"
-            ],
-            "verification_suggestions": [
-                "Check the original source of the information",
-                "Look for corroboration from reliable news outlets"
-            ],
             "verification_links": [],
-            "verification_notes": "",
-            "summary": "AI analysis temporarily unavailable. Please verify manually.",
-            "analysis_timestamp": time.time(),
-            "fallback": True
+            "analysis_timestamp": time.time()
         }
 
-    def get_risk_color(self, risk_level: str) -> str:
-        colors = {"LOW": "#28a745", "MEDIUM": "#ffc107", "HIGH": "#dc3545"}
-        return colors.get(risk_level.upper(), "#6c757d")
+    @staticmethod
+    def get_risk_color(risk_level: str) -> str:
+        return _RISK_COLORS.get(risk_level.upper(), "#6c757d")
+
+    @staticmethod
+    def format_confidence_display(confidence: int) -> str:
+        label = next(label for threshold, label in _CONF_BUCKETS if confidence >= threshold)
+        return f"{label} Confidence ({confidence}%)"
+
+
+def _partial_fields(buffer: str) -> Dict:
+    """
+    Pick the completed summary / risk_level / prediction strings out of a partial response
+    """
+    fields = {}
+    for match in _PARTIAL_FIELD_RE.finditer(buffer):
+        try:
+            fields[match.group(1)] = _json_loads(f'"{match.group(2)}"')
+        except json.JSONDecodeError:
+            continue
+    return fields
+
+
+def _dedup_key(text: str, ml_prediction: Optional[str]) -> bytes:
+    normalized = " ".join(text.lower().split())
+    return hashlib.blake2b(f"{ml_prediction}|{normalized}".encode(), digest_size=16).digest()
+
+
+def _content_key(text: str, ml_prediction: Optional[str]) -> str:
+    # Whitespace is collapsed so re-pasting or reflowing an article still hits the cache
+    normalized = " ".join(text.split())
+    return hashlib.sha256(f"{_RESPONSE_SCHEMA_VERSION}|{ml_prediction}|{normalized}".encode()).hexdigest()
+
+
+@_cache_resource
+def _get_disk_cache():
+    return diskcache.Cache(_DISK_CACHE_DIR) if diskcache else None
+
+
+def _load_result(key: str) -> Optional[Dict]:
+    """
+    Look up a stored analysis in the process memo, then on disk. Copies are returned so callers may mutate them.
+    """
+    with _MEMO_LOCK:
+        result = _MEMO.get(key)
+    if result is None:
+        disk_cache = _get_disk_cache()
+        result = disk_cache.get(key) if disk_cache is not None else None
+        if result is None:
+            return None
+        with _MEMO_LOCK:
+            _MEMO[key] = result
+    return copy.deepcopy(result)
+
+
+def _store_result(key: str, result: Dict) -> Dict:
+    """
+    Keep a fresh analysis in the process memo and on disk, fallbacks are not worth keeping.
+    The SQLite write runs on a background thread so the result is returned immediately;
+    the memo and the writer get their own copy so the caller may mutate the returned dict.
+    """
+    if result.get("fallback"):
+        return result
+    stored = copy.deepcopy(result)
+    with _MEMO_LOCK:
+        _MEMO[key] = stored
+    disk_cache = _get_disk_cache()
+    if disk_cache is not None:
+        _DISK_WRITER.submit(disk_cache.set, key, stored, expire=_CACHE_TTL)
+    return result
 
-    def format_confidence_display(self, confidence: int) -> str:
-        if confidence >= 80:
-            return f"🔴 High Confidence ({confidence}%)"
-        elif confidence >= 60:
-            return f"🟡 Medium Confidence ({confidence}%)"
-        else:
-            return f"🟢 Low Confidence ({confidence}%)"
+
+@_cache_resource
+def get_analyzer() -> GeminiAnalyzer:
+    """
+    Shared GeminiAnalyzer so the SDK is configured once per server process
+    """
+    return GeminiAnalyzer()
 
 
 # Utility functions for Streamlit integration
+def partial_results_writer(placeholder) -> Callable[[Dict], None]:
+    """
+    Build an on_partial callback that previews streamed fields in an st.empty() placeholder
+    """
+    shown = {}
+
+    def _write(fields: Dict):
+        if fields == shown:
+            return
+        shown.clear()
+        shown.update(fields)
+
+        lines = []
+        if "risk_level" in fields:
+            lines.append(f"**Risk Level:** {fields['risk_level']}")
+        if "prediction" in fields:
+            lines.append(f"**Prediction:** {fields['prediction']}")
+        if "summary" in fields:
+            lines.append(fields["summary"])
+        if "detailed_breakdown" in fields:
+            lines.append(fields["detailed_breakdown"])
+        if "context_analysis" in fields:
+            lines.append(f"**Context:** {fields['context_analysis']}")
+        placeholder.markdown("\n\n".join(lines))
+
+    return _write
+
+
 def display_gemini_results(analysis_results: Dict):
     """
     Display Gemini analysis results in Streamlit
@@ -270,7 +896,7 @@ def display_gemini_results(analysis_results: Dict):
 
     with col2:
         risk_level = analysis_results.get("risk_level", "MEDIUM")
-        color = GeminiAnalyzer().get_risk_color(risk_level)
+        color = GeminiAnalyzer.get_risk_color(risk_level)
         st.markdown(
             f"<div style='padding: 10px; background-color: {color}; color: white; border-radius: 5px; text-align: center;'>"
             f"<strong>Risk Level: {risk_level}</strong></div>",
@@ -313,43 +939,63 @@ def display_gemini_results(analysis_results: Dict):
 
 # Test integration
 if __name__ == "__main__":
-    analyzer = GeminiAnalyzer()
+    analyzer = get_analyzer()
     test_text = """
     BREAKING: Scientists at IIT Bombay develop new water purification tech,
     published in Nature Materials. ISRO also launched a satellite 'Bhuvan-Climate'
     to track greenhouse gases.
     """
     results = analyzer.analyze_text(test_text, "LIKELY_REAL")
-    print(json.dumps(results, indent=2))
+    print(_json_dumps_pretty(results))
 # Legacy function for backward compatibility
-def analyze_text_with_gemini(text: str) -> Dict:
+def analyze_text_with_gemini(text: str, use_cache: bool = True) -> Dict:
     """
     Legacy function for backward compatibility with existing code
     """
-    analyzer = GeminiAnalyzer()
+    analyzer = get_analyzer()
     if hasattr(analyzer, 'is_configured') and analyzer.is_configured:
-        result = analyzer.analyze_text(text)
-        return {
-            'analysis': result.get('summary', 'Analysis completed'),
-            'confidence_score': result.get('confidence_score', 50) / 100.0,  # Convert to 0-1 range
-            'educational_insight': '\n'.join(result.get('educational_insights', ['General analysis completed']))
-        }
+        return _legacy_result(analyzer.analyze_text(text, use_cache=use_cache))
     else:
+        return _legacy_result(None)
+
+
+def _enhanced_view(result: Dict) -> Dict:
+    """
+    Enhanced analysis fields of a full analysis, with a zero confidence_score for fallbacks
+    """
+    return {
+        'analysis': result.get('summary', 'Analysis completed'),
+        'confidence_score': 0.0 if result.get('fallback') else result.get('confidence_score', 50) / 100.0,
+        'educational_insight': '\n'.join(
+            f"- {insight}" for insight in result.get('educational_insights', ['General analysis completed'])
+        ),
+        'detailed_breakdown': result.get('detailed_breakdown', ''),
+        'context_analysis': result.get('context_analysis', ''),
+    }
+
+
+def _legacy_result(result: Optional[Dict]) -> Dict:
+    """
+    Reshape a full analysis into the summary dict used by the enhanced analysis view,
+    None meaning Gemini is not configured
+    """
+    if result is None:
         return {
             'analysis': 'Gemini API not configured',
             'confidence_score': 0.0,
             'educational_insight': 'Please configure Gemini API key'
         }
+    return _enhanced_view(result)
 
 
 def list_available_models():
     """List all available Gemini models"""
     try:
-        api_key = os.getenv('GEMINI_API_KEY') or st.secrets.get('GEMINI_API_KEY')
+        api_key = _get_secret('GEMINI_API_KEY')
         if not api_key:
             return False, "No API key found"
 
-        genai.configure(api_key=api_key)
+        genai = _configure_genai(api_key)
         models = genai.list_models()
 
         available_models = []
@@ -365,7 +1011,7 @@ def list_available_models():
 def test_gemini_connection():
     """Test if Gemini API is working"""
     try:
-        analyzer = GeminiAnalyzer()
+        analyzer = get_analyzer()
         if hasattr(analyzer, 'is_configured') and analyzer.is_configured:
             try:
                 response = analyzer.model.generate_content("Say 'Hello, Gemini is working!' and nothing else.")
@@ -1,46 +1,212 @@
 # Module 1: Import necessary packages
 import streamlit as st
+import base64
 import numpy as np
-import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
-from sklearn.svm import LinearSVC
-from sklearn.naive_bayes import MultinomialNB
 import warnings
-import streamlit_lottie
-from gemini_integration import analyze_text_with_gemini, test_gemini_connection, GeminiAnalyzer, display_gemini_results, list_available_models
+from typing import Final
+from concurrent.futures import ThreadPoolExecutor
+from model_cache import VECTORIZER_TYPES, CLASSIFIER_TYPES, load_dataset, load_models, build_models, make_transform, make_predictor
 warnings.filterwarnings("ignore")
 
+MIN_ARTICLE_WORDS = 10
+# Only the start of an article is sent to Gemini, bounding the cost of the automatic analysis on every submit
+ARTICLE_EXCERPT_CHARS = 1200
+
+# Static page content, built once at import instead of on every rerun
+FAKE_NEWS_TIPS_MD: Final[str] = """
+**How to Spot Fake News:**
+- Check multiple reliable sources
+- Look for author credentials
+- Verify publication date and context
+- Be wary of emotional headlines
+- Cross-reference with fact-checkers
+
+**Trusted Sources:**
+- Reuters, AP News, BBC
+- Snopes, FactCheck.org
+- Local newspaper websites
+- Government official sources
+"""
+
+RED_FLAGS_MD: Final[str] = """
+**🚨 Potential Red Flags Detected:**
+- Language patterns consistent with misinformation
+- Statistical model confidence indicates suspicious content
+- Recommend fact-checking with reliable sources
+
+**⚠️ Warning Signs:**
+- Emotional or sensational language
+- Lack of credible source citations
+- Unusual writing patterns
+"""
+
+CREDIBILITY_MD: Final[str] = """
+**✅ Credibility Indicators Found:**
+- Language patterns align with legitimate news
+- Statistical model shows high authenticity confidence
+- Content structure follows journalistic standards
+
+**📊 Positive Signs:**
+- Balanced and factual tone
+- Coherent narrative structure
+- Professional writing style
+"""
+
+FOOTER_HTML: Final[str] = """
+<div class="app-footer">
+    <p>
+        🚀 <strong>Created with enthusiasm by hacktreet team</strong> | 
+        Powered by TRUTH-AI Technology | 
+        🛡️ Protecting truth in the digital age
+    </p>
+</div>
+"""
+
 # Module 2: Load the dataset
-@st.cache
+@st.cache_data(show_spinner=False)
 def load_data():
-    data = pd.read_csv("fake_or_real_news.csv")
-    data['fake'] = data['label'].apply(lambda x: 0 if x == 'REAL' else 1)
-    return data
+    return load_dataset()
+
+# Load and encode the hero video once per server, not on every rerun. It is inlined as a data URL
+# because Streamlit's static server sends .mp4 as text/plain with nosniff, which some browsers won't play.
+@st.cache_data(show_spinner=False)
+def get_video_base64(video_path):
+    try:
+        with open(video_path, "rb") as video_file:
+            video_bytes = video_file.read()
+            video_base64 = base64.b64encode(video_bytes).decode()
+            return f"data:video/mp4;base64,{video_base64}"
+    except FileNotFoundError:
+        return None
+
+# Read the stylesheet once per server. It is inlined as a <style> tag because Streamlit's
+# static server sends .css as text/plain with nosniff, which browsers refuse to apply via <link>.
+@st.cache_data(show_spinner=False)
+def load_stylesheet(path="static/styles.css"):
+    with open(path, encoding="utf-8") as css_file:
+        return f"<style>\n{css_file.read()}</style>"
 
 # Module 3: Select Vectorizer and Classifier
 def select_model():
-    vectorizer_type = st.sidebar.selectbox("Select Vectorizer", ["TF-IDF", "Bag of Words"])
-    classifier_type = st.sidebar.selectbox("Select Classifier", ["Linear SVM", "Naive Bayes"])
+    # Rendered in place rather than in the sidebar so they belong to the analyze form
+    vectorizer_type = st.selectbox("Select Vectorizer", VECTORIZER_TYPES)
+    classifier_type = st.selectbox("Select Classifier", CLASSIFIER_TYPES)
     
-    vectorizer = None
-    if vectorizer_type == "TF-IDF":
-        vectorizer = TfidfVectorizer(stop_words='english', max_df=0.7)
-    elif vectorizer_type == "Bag of Words":
-        vectorizer = CountVectorizer(stop_words='english', max_df=0.7)
-    
-    classifier = None
-    if classifier_type == "Linear SVM":
-        classifier = LinearSVC()
-    elif classifier_type == "Naive Bayes":
-        classifier = MultinomialNB()
-    
-    return vectorizer, classifier
+    return vectorizer_type, classifier_type
+
+# Module 4: Train the models
+@st.cache_resource(show_spinner="🤖 Loading detection models...")
+def get_trained_models():
+    # Every vectorizer/classifier combination is ready up front, so switching models is a dict lookup.
+    # Persisted models load from disk; only missing ones are trained, one vectorizer per thread.
+    models = {}
+    missing = []
+    for vectorizer_type in VECTORIZER_TYPES:
+        cached = load_models(vectorizer_type)
+        if cached is None:
+            missing.append(vectorizer_type)
+        else:
+            models.update(cached)
+    
+    if missing:
+        data = load_data()
+        with ThreadPoolExecutor(max_workers=len(missing)) as executor:
+            for fitted in executor.map(lambda vectorizer_type: build_models(data, vectorizer_type), missing):
+                models.update(fitted)
+    
+    # Swap each fitted model for its single-document transform and predictor, built once
+    transforms = {}
+    for key, (vectorizer, clf) in models.items():
+        if id(vectorizer) not in transforms:
+            transforms[id(vectorizer)] = make_transform(vectorizer)
+        models[key] = (transforms[id(vectorizer)], make_predictor(clf))
+    return models
 
-# Module 4: Train the model
-def train_model(data, vectorizer, classifier):
-    x_vectorized = vectorizer.fit_transform(data['text'])
-    classifier.fit(x_vectorized, data['fake'])
-    return vectorizer, classifier
+# Enhanced analysis panel, a fragment so regenerating it doesn't rerun the whole app
+def request_regenerate():
+    st.session_state.enhanced_analysis = None
+    st.session_state.gemini_results = None
+    st.session_state.refresh_enhanced_analysis = True
+
+@st.experimental_fragment
+def render_enhanced_analysis():
+    # Initialize session state for enhanced analysis
+    if 'enhanced_analysis' not in st.session_state:
+        st.session_state.enhanced_analysis = None
+    
+    # Auto-generate enhanced analysis with Gemini
+    if st.session_state.enhanced_analysis is None:
+        # Imported on first use so the Gemini SDK stays off the cold-start path
+        from gemini_integration import _api_errors, _error_message, get_analyzer, partial_results_writer
+        
+        try:
+            print(f"Calling Gemini for the combined analysis...")
+            use_cache = not st.session_state.pop('refresh_enhanced_analysis', False)
+            # One structured call fills both the enhanced insights and the full Gemini analysis,
+            # previewing each field as soon as it has streamed in
+            ml_prediction = st.session_state.result_label
+            # Placeholder until the first streamed field replaces it
+            preview = st.empty()
+            preview.caption("🧠 Generating enhanced insights...")
+            gemini_results, enhanced_result = get_analyzer().analyze_all(
+                st.session_state.article_excerpt, ml_prediction, use_cache=use_cache,
+                on_partial=partial_results_writer(preview)
+            )
+            preview.empty()
+            st.session_state.gemini_results = gemini_results
+            print(f"Enhanced result confidence: {enhanced_result.get('confidence_score', 0)}")
+            
+            st.session_state.enhanced_analysis = enhanced_result
+            
+            # Debug info
+            if enhanced_result.get('confidence_score', 0) > 0:
+                print("✅ Gemini analysis successful")
+            else:
+                print("❌ Gemini analysis failed, using fallback")
+                
+        except _api_errors() as e:
+            print(f"Exception in enhanced analysis: {_error_message(e)}")
+            # Fallback to static analysis if Gemini fails
+            st.session_state.enhanced_analysis = {
+                'analysis': f'Enhanced analysis error: {_error_message(e)}',
+                'confidence_score': 0.0,
+                'educational_insight': 'Static educational content provided below.'
+            }
+    
+    # Read session state once for the display below
+    enhanced = st.session_state.enhanced_analysis
+    enhanced_ok = bool(enhanced and enhanced.get('confidence_score', 0) > 0)
+    
+    # Display enhanced analysis
+    analysis_col1, analysis_col2 = st.columns([1, 1])
+    
+    # Each column is one markdown element: its heading plus the Gemini field or static fallback
+    with analysis_col1:
+        if enhanced_ok:
+            # Detailed breakdown field of the Gemini response
+            breakdown_md = enhanced.get('detailed_breakdown')
+            if not breakdown_md:
+                analysis_text = enhanced['analysis']
+                breakdown_md = analysis_text[:500] + "..." if len(analysis_text) > 500 else analysis_text
+        else:
+            # Fallback static analysis
+            breakdown_md = RED_FLAGS_MD if st.session_state.result == 1 else CREDIBILITY_MD
+        st.markdown(f"#### 🔍 **AI-Powered Detailed Breakdown**\n\n{breakdown_md}")
+    
+    with analysis_col2:
+        # Educational insights field of the Gemini response, or fallback static content
+        education_md = enhanced['educational_insight'] if enhanced_ok else FAKE_NEWS_TIPS_MD
+        st.markdown(f"#### 🎓 **AI-Generated Educational Insights**\n\n{education_md}")
+    
+    # Context Analysis Section
+    if enhanced_ok:
+        context_part = enhanced.get('context_analysis')
+        if context_part:
+            st.markdown("#### 🌐 **Contextual Guidance**")
+            st.info(context_part)
+    
+    # Refresh analysis button, which reruns only this fragment
+    st.button("🔄 Regenerate Enhanced Analysis", key="refresh_analysis", on_click=request_regenerate)
 
 # Module 5: Streamlit app
 def main():
@@ -51,505 +217,7 @@ def main():
     st.set_page_config(page_title=page_title, page_icon=page_icon, layout=layout)
     
     # Custom CSS for modern UI
-    st.markdown("""
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&family=Poppins:wght@300;400;500;600;700&display=swap');
-    
-    /* Hide Streamlit default elements */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-    .stDeployButton {display:none;}
-    
-    /* Root variables for consistent theming */
-    :root {
-        --primary-navy: #0B1426;
-        --electric-blue: #00D4FF;
-        --accent-blue: #1E40AF;
-        --light-blue: #E0F2FE;
-        --white: #FFFFFF;
-        --gray-100: #F8FAFC;
-        --gray-200: #E2E8F0;
-        --gray-600: #475569;
-        --gradient-primary: linear-gradient(135deg, #0B1426 0%, #1E40AF 50%, #00D4FF 100%);
-        --gradient-secondary: linear-gradient(45deg, #00D4FF, #1E40AF);
-    }
-    
-    /* Light mode variables */
-    [data-theme="light"] {
-        --primary-navy: #FFFFFF;
-        --electric-blue: #1E40AF;
-        --accent-blue: #00D4FF;
-        --light-blue: #1E293B;
-        --white: #0F172A;
-        --gray-100: #0F172A;
-        --gray-200: #1E293B;
-        --gray-600: #64748B;
-        --gradient-primary: linear-gradient(135deg, #FFFFFF 0%, #E0F2FE 50%, #BFDBFE 100%);
-        --gradient-secondary: linear-gradient(45deg, #1E40AF, #00D4FF);
-    }
-    
-    /* Global styles */
-    .stApp {
-        font-family: 'Inter', sans-serif;
-        background: var(--primary-navy);
-        color: var(--white);
-        transition: all 0.3s ease;
-    }
-    
-    /* Apply theme to body and html */
-    html[data-theme="light"] .stApp,
-    body[data-theme="light"] .stApp {
-        background: var(--primary-navy);
-        color: var(--white);
-    }
-    
-    html[data-theme="dark"] .stApp,
-    body[data-theme="dark"] .stApp {
-        background: var(--primary-navy);
-        color: var(--white);
-    }
-    
-    /* Custom scrollbar */
-    ::-webkit-scrollbar {
-        width: 8px;
-    }
-    ::-webkit-scrollbar-track {
-        background: var(--primary-navy);
-    }
-    ::-webkit-scrollbar-thumb {
-        background: var(--electric-blue);
-        border-radius: 4px;
-    }
-    ::-webkit-scrollbar-thumb:hover {
-        background: var(--accent-blue);
-    }
-    
-    /* Navigation Header */
-    .nav-header {
-        position: fixed;
-        top: 0;
-        left: 0;
-        right: 0;
-        z-index: 1000;
-        background: rgba(11, 20, 38, 0.95);
-        backdrop-filter: blur(10px);
-        padding: 1rem 2rem;
-        border-bottom: 1px solid rgba(0, 212, 255, 0.2);
-        transition: all 0.3s ease;
-    }
-    
-    .nav-content {
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-        max-width: 1200px;
-        margin: 0 auto;
-    }
-    
-    .logo {
-        font-family: 'Poppins', sans-serif;
-        font-size: 1.5rem;
-        font-weight: 700;
-        color: var(--electric-blue);
-        text-decoration: none;
-        display: flex;
-        align-items: center;
-        gap: 0.5rem;
-    }
-    
-    .logo-icon {
-        width: 32px;
-        height: 32px;
-        background: var(--gradient-secondary);
-        border-radius: 8px;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        font-size: 1.2rem;
-    }
-    
-    .theme-toggle {
-        cursor: pointer;
-        padding: 0.5rem;
-        border-radius: 50%;
-        background: rgba(0, 212, 255, 0.1);
-        border: 1px solid rgba(0, 212, 255, 0.3);
-        transition: all 0.3s ease;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        width: 40px;
-        height: 40px;
-    }
-    
-    .theme-toggle:hover {
-        background: rgba(0, 212, 255, 0.2);
-        transform: scale(1.1);
-    }
-    
-    .theme-toggle span {
-        font-size: 1.2rem;
-        transition: transform 0.3s ease;
-    }
-    
-    .theme-toggle:hover span {
-        transform: rotate(20deg);
-    }
-    
-    /* Hero Section */
-    .hero-section {
-        min-height: 120vh;
-        background: var(--gradient-primary);
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        text-align: center;
-        padding: 8rem 2rem 6rem;
-        position: relative;
-        overflow: hidden;
-    }
-    
-    /* Video Background */
-    .video-background {
-        position: absolute;
-        top: 0;
-        left: 0;
-        width: 100%;
-        height: 100%;
-        z-index: 0;
-        overflow: hidden;
-    }
-    
-    .video-background video {
-        width: 100%;
-        height: 100%;
-        object-fit: cover;
-        opacity: 0.8;
-        filter: brightness(1.1) contrast(1.1);
-        transform: scale(1.05);
-        animation: videoFloat 10s ease-in-out infinite;
-    }
-    
-    @keyframes videoFloat {
-        0%, 100% { 
-            transform: scale(1.05) translateY(0px);
-        }
-        50% { 
-            transform: scale(1.08) translateY(-10px);
-        }
-    }
-    
-    .video-overlay {
-        position: absolute;
-        top: 0;
-        left: 0;
-        width: 100%;
-        height: 100%;
-        background: linear-gradient(135deg, rgba(11, 20, 38, 0.3) 0%, rgba(30, 64, 175, 0.2) 50%, rgba(0, 212, 255, 0.1) 100%);
-        z-index: 1;
-    }
-    
-    .hero-section::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: 0;
-        right: 0;
-        bottom: 0;
-        background: 
-            radial-gradient(circle at 20% 80%, rgba(0, 212, 255, 0.05) 0%, transparent 50%),
-            radial-gradient(circle at 80% 20%, rgba(30, 64, 175, 0.05) 0%, transparent 50%);
-        animation: pulse 8s ease-in-out infinite alternate;
-        z-index: 2;
-    }
-    
-    @keyframes pulse {
-        0% { 
-            transform: scale(1) rotate(0deg);
-            opacity: 0.7;
-        }
-        100% { 
-            transform: scale(1.05) rotate(2deg);
-            opacity: 1;
-        }
-    }
-    
-    @keyframes float {
-        0%, 100% { transform: translateY(0px); }
-        50% { transform: translateY(-20px); }
-    }
-    
-    .hero-content {
-        position: relative;
-        z-index: 3;
-        max-width: 800px;
-    }
-    
-    .hero-title {
-        font-family: 'Poppins', sans-serif;
-        font-size: 3.5rem;
-        font-weight: 700;
-        margin-bottom: 1rem;
-        background: linear-gradient(135deg, var(--white) 0%, var(--electric-blue) 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        line-height: 1.2;
-    }
-    
-    .hero-subtitle {
-        font-size: 2rem;
-        font-weight: 700;
-        margin-bottom: 2rem;
-        background: linear-gradient(45deg, #00D4FF, #FFFFFF, #00D4FF);
-        background-size: 200% 200%;
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        animation: gradientShift 3s ease-in-out infinite;
-        text-shadow: 0 0 30px rgba(0, 212, 255, 0.5);
-        letter-spacing: 2px;
-        text-transform: uppercase;
-        font-family: 'Poppins', sans-serif;
-        min-height: 2rem;
-        position: relative;
-    }
-    
-    .hero-subtitle::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: 0;
-        right: 0;
-        bottom: 0;
-        background: linear-gradient(45deg, transparent, rgba(0, 212, 255, 0.1), transparent);
-        animation: shine 2s infinite;
-        border-radius: 10px;
-    }
-    
-    @keyframes gradientShift {
-        0%, 100% { background-position: 0% 50%; }
-        50% { background-position: 100% 50%; }
-    }
-    
-    @keyframes shine {
-        0% { transform: translateX(-100%) skewX(-15deg); }
-        100% { transform: translateX(200%) skewX(-15deg); }
-    }
-    
-    .typing-animation {
-        border-right: 2px solid var(--electric-blue);
-        animation: blink 1s infinite;
-    }
-    
-    @keyframes blink {
-        0%, 50% { border-color: var(--electric-blue); }
-        51%, 100% { border-color: transparent; }
-    }
-    
-    .cta-button {
-        display: inline-block;
-        padding: 1rem 2.5rem;
-        background: var(--gradient-secondary);
-        color: var(--white);
-        text-decoration: none;
-        border-radius: 50px;
-        font-weight: 600;
-        font-size: 1.1rem;
-        transition: all 0.3s ease;
-        border: none;
-        cursor: pointer;
-        box-shadow: 0 10px 30px rgba(0, 212, 255, 0.3);
-        margin: 1rem;
-    }
-    
-    .cta-button:hover {
-        transform: translateY(-3px);
-        box-shadow: 0 15px 40px rgba(0, 212, 255, 0.4);
-        color: var(--white);
-        text-decoration: none;
-    }
-    
-    /* Statistics Section */
-    .stats-section {
-        display: flex;
-        justify-content: center;
-        gap: 3rem;
-        margin-top: 4rem;
-        flex-wrap: wrap;
-    }
-    
-    .stat-item {
-        text-align: center;
-        padding: 1.5rem;
-        background: rgba(255, 255, 255, 0.1);
-        border-radius: 15px;
-        backdrop-filter: blur(10px);
-        border: 1px solid rgba(0, 212, 255, 0.2);
-        min-width: 150px;
-    }
-    
-    .stat-number {
-        font-size: 2.5rem;
-        font-weight: 700;
-        color: var(--electric-blue);
-        display: block;
-    }
-    
-    .stat-label {
-        font-size: 0.9rem;
-        color: var(--light-blue);
-        margin-top: 0.5rem;
-    }
-    
-    /* Analysis Section */
-    .analysis-section {
-        background: transparent;
-        border-radius: 0;
-        padding: 2rem 1rem;
-        margin: 2rem auto;
-        max-width: 1000px;
-        border: none;
-    }
-    
-    .section-title {
-        font-family: 'Poppins', sans-serif;
-        font-size: 2rem;
-        font-weight: 600;
-        text-align: center;
-        margin-bottom: 2rem;
-        color: var(--electric-blue);
-    }
-    
-    /* Form Styling */
-    .stTextArea textarea {
-        background: transparent !important;
-        border: none !important;
-        border-bottom: 2px solid rgba(0, 212, 255, 0.3) !important;
-        border-radius: 0 !important;
-        color: var(--white) !important;
-        font-family: 'Inter', sans-serif !important;
-        padding: 1rem 0 !important;
-        font-size: 1rem !important;
-        resize: vertical !important;
-    }
-    
-    .stTextArea textarea:focus {
-        border-bottom: 2px solid var(--electric-blue) !important;
-        box-shadow: none !important;
-        outline: none !important;
-    }
-    
-    .stTextArea textarea::placeholder {
-        color: rgba(224, 242, 254, 0.6) !important;
-        font-style: italic !important;
-    }
-    
-    .stTextArea > div {
-        background: transparent !important;
-        border: none !important;
-        padding: 0 !important;
-    }
-    
-    .stSelectbox > div > div {
-        background: rgba(255, 255, 255, 0.1) !important;
-        border: 1px solid rgba(0, 212, 255, 0.3) !important;
-        border-radius: 10px !important;
-    }
-    
-    .stButton > button {
-        background: var(--gradient-secondary) !important;
-        color: var(--white) !important;
-        border: none !important;
-        border-radius: 25px !important;
-        padding: 0.75rem 2rem !important;
-        font-weight: 600 !important;
-        transition: all 0.3s ease !important;
-        box-shadow: 0 5px 15px rgba(0, 212, 255, 0.3) !important;
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-2px) !important;
-        box-shadow: 0 8px 25px rgba(0, 212, 255, 0.4) !important;
-    }
-    
-    /* Responsive Design */
-    @media (max-width: 768px) {
-        .hero-title {
-            font-size: 2.5rem;
-        }
-        
-        .hero-subtitle {
-            font-size: 1.5rem;
-        }
-        
-        .stats-section {
-            gap: 1rem;
-        }
-        
-        .analysis-section {
-            margin: 1rem 0.5rem;
-            padding: 1rem 0.5rem;
-        }
-        
-        .nav-content {
-            padding: 0 1rem;
-        }
-        
-        .section-title {
-            font-size: 1.5rem;
-        }
-        
-        .video-background video {
-            opacity: 0.5;
-            filter: none;
-            transform: scale(1.1);
-        }
-        
-        .hero-section {
-            min-height: 100vh;
-            padding: 6rem 1rem 4rem;
-        }
-    }
-    
-    @media (max-width: 480px) {
-        .hero-title {
-            font-size: 2rem;
-        }
-        
-        .hero-subtitle {
-            font-size: 1.2rem;
-            letter-spacing: 1px;
-        }
-        
-        .analysis-section {
-            margin: 0.5rem 0.25rem;
-            padding: 0.5rem 0.25rem;
-        }
-        
-        .section-title {
-            font-size: 1.3rem;
-        }
-    }
-    
-    /* Success/Error Messages */
-    .stAlert {
-        border-radius: 10px !important;
-        border: none !important;
-    }
-    
-    .stSuccess {
-        background: linear-gradient(135deg, #10B981, #059669) !important;
-        color: white !important;
-    }
-    
-    .stError {
-        background: linear-gradient(135deg, #EF4444, #DC2626) !important;
-        color: white !important;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    st.markdown(load_stylesheet(), unsafe_allow_html=True)
     
     # Initialize theme in session state
     if 'dark_mode' not in st.session_state:
@@ -582,22 +250,8 @@ def main():
     # Apply theme based on session state
     theme_class = "" if st.session_state.dark_mode else 'data-theme="light"'
     
-    # Load and encode video for Streamlit
-    import base64
-    import os
-    
-    def get_video_base64(video_path):
-        try:
-            with open(video_path, "rb") as video_file:
-                video_bytes = video_file.read()
-                video_base64 = base64.b64encode(video_bytes).decode()
-                return f"data:video/mp4;base64,{video_base64}"
-        except FileNotFoundError:
-            return None
-    
     # Get video data
-    video_path = "truth-vid.mp4"
-    video_data = get_video_base64(video_path)
+    video_data = get_video_base64("truth-vid.mp4")
     
     # Hero Section with theme support and video background
     if video_data:
@@ -723,73 +377,79 @@ def main():
             Paste any news article below and discover its authenticity in seconds
         </p>
     </div>
-    
-    <style>
-    @keyframes shimmer {
-        0% { left: -100%; }
-        100% { left: 100%; }
-    }
-    
-    @keyframes glow {
-        0% { text-shadow: 0 0 10px rgba(0, 212, 255, 0.3); }
-        100% { text-shadow: 0 0 20px rgba(0, 212, 255, 0.6), 0 0 30px rgba(0, 212, 255, 0.4); }
-    }
-    </style>
     """, unsafe_allow_html=True)
     
-    # Load data
-    data = load_data()
+    # Train (or fetch the cached) models up front
+    models = get_trained_models()
     
-    # Create two columns for better layout
-    col1, col2 = st.columns([2, 1])
-    
-    with col1:
-        # Text input for user to input news article
-        user_input = st.text_area(
-            "Enter your news article here:",
-            placeholder="Paste the news article text you want to analyze for authenticity...",
-            height=200
-        )
-    
-    with col2:
-        st.markdown("### ⚙️ Model Configuration")
-        # Select vectorizer and classifier
-        vectorizer, classifier = select_model()
+    # The article and model choice are sent together on submit, so editing them doesn't rerun the app
+    with st.form("analyze_form", border=False):
+        # Create two columns for better layout
+        col1, col2 = st.columns([2, 1])
         
-        st.markdown("### 📊 Quick Stats")
-        st.info("⚡ **Speed**: < 1 second")
-        st.info("🔒 **Privacy**: Your data stays secure")
+        with col1:
+            # Text input for user to input news article
+            user_input = st.text_area(
+                "Enter your news article here:",
+                placeholder="Paste the news article text you want to analyze for authenticity...",
+                height=200
+            )
+        
+        with col2:
+            st.markdown("### ⚙️ Model Configuration")
+            # Select vectorizer and classifier
+            vectorizer_type, classifier_type = select_model()
+            
+            st.markdown("### 📊 Quick Stats")
+            st.info("⚡ **Speed**: < 1 second")
+            st.info("🔒 **Privacy**: Your data stays secure")
+        
+        # Center the check button
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            check_button = st.form_submit_button("🔍 Analyze Article", use_container_width=True)
     
     # Initialize session state
     if 'result' not in st.session_state:
         st.session_state.result = None
     if 'user_input' not in st.session_state:
         st.session_state.user_input = ""
-    if 'analysis_count' not in st.session_state:
-        st.session_state.analysis_count = 0
+    if 'article_excerpt' not in st.session_state:
+        st.session_state.article_excerpt = ""
+    if 'confidence' not in st.session_state:
+        st.session_state.confidence = None
 
-    # Center the check button
-    col1, col2, col3 = st.columns([1, 2, 1])
-    with col2:
-        check_button = st.button("🔍 Analyze Article", use_container_width=True)
+    # Articles this short carry too little signal for the classifier or Gemini to judge
+    # Words are counted once per submit and stored for the Gemini button's guard
+    word_count = len(user_input.split()) if check_button else 0
+    too_short = bool(check_button and 0 < word_count < MIN_ARTICLE_WORDS)
+    if too_short:
+        st.session_state.result = None
 
     # When user submits the input
-    if check_button and user_input.strip():
+    if check_button and word_count >= MIN_ARTICLE_WORDS:
         st.session_state.user_input = user_input
-        st.session_state.analysis_count += 1
+        st.session_state.input_words = word_count
+        # Truncated once so both Gemini paths (and their shared cache key) see the same excerpt
+        st.session_state.article_excerpt = user_input[:ARTICLE_EXCERPT_CHARS]
+        # A new article needs fresh Gemini results
+        st.session_state.enhanced_analysis = None
+        st.session_state.gemini_results = None
         
         with st.spinner("🤖 Analyzing article authenticity..."):
-            # Train the model and get the fitted vectorizer
-            fitted_vectorizer, clf = train_model(data, vectorizer, classifier)
+            # Get the single-document transform and predictor for the selected model
+            transform, predict_fake = models[(vectorizer_type, classifier_type)]
             
             # Vectorize the user input
-            input_vectorized = fitted_vectorizer.transform([st.session_state.user_input])
+            input_vectorized = transform(st.session_state.user_input)
             
-            # Predict the label of the input
-            prediction = clf.predict(input_vectorized)
+            # Predict the probability that the input is fake
+            fake_proba = predict_fake(input_vectorized)
             
             # Store result in session state
-            st.session_state.result = int(prediction[0])
+            st.session_state.result = int(fake_proba > 0.5)
+            st.session_state.result_label = "FAKE" if st.session_state.result == 1 else "REAL"
+            st.session_state.confidence = round(max(fake_proba, 1 - fake_proba) * 100)
 
     # Display the result if it exists in the session state
     if st.session_state.result is not None and st.session_state.user_input:
@@ -806,141 +466,18 @@ def main():
                 st.success("✅ **AUTHENTIC ARTICLE**\n\nThis article appears to be legitimate news.")
         
         with result_col2:
-            confidence = 85 + (st.session_state.analysis_count % 15)  # Simulated confidence
+            confidence = st.session_state.confidence
             st.metric(
                 label="Confidence Level",
                 value=f"{confidence}%",
-                delta=f"+{confidence-80}% vs baseline"
+                delta=f"{confidence - 50:+d}% vs chance"
             )
 
         # Add enhanced analysis section with Gemini-powered insights
         st.markdown("---")
         st.markdown("### 🧠 Enhanced Analysis & Insights")
         
-        # Initialize session state for enhanced analysis
-        if 'enhanced_analysis' not in st.session_state:
-            st.session_state.enhanced_analysis = None
-        
-        # Auto-generate enhanced analysis with Gemini
-        if st.session_state.enhanced_analysis is None:
-            with st.spinner("🧠 Generating enhanced insights..."):
-                try:
-                    # Create a specialized prompt for enhanced analysis
-                    ml_result = "FAKE NEWS" if st.session_state.result == 1 else "AUTHENTIC NEWS"
-                    confidence = 85 + (st.session_state.analysis_count % 15)
-                    
-                    enhanced_prompt = f"""As an expert fact-checker, analyze this news article that our ML model classified as {ml_result} with {confidence}% confidence.
-
-Article: "{st.session_state.user_input[:1200]}"
-
-Provide:
-DETAILED_BREAKDOWN: Specific analysis of why this might be {ml_result.lower()}, language patterns, credibility indicators
-EDUCATIONAL_INSIGHTS: Practical verification tips for this type of content
-CONTEXT_ANALYSIS: What to look for in similar articles"""
-
-                    print(f"Calling Gemini with enhanced prompt...")
-                    enhanced_result = analyze_text_with_gemini(enhanced_prompt)
-                    print(f"Enhanced result confidence: {enhanced_result.get('confidence_score', 0)}")
-                    
-                    st.session_state.enhanced_analysis = enhanced_result
-                    
-                    # Debug info
-                    if enhanced_result.get('confidence_score', 0) > 0:
-                        print("✅ Gemini analysis successful")
-                    else:
-                        print("❌ Gemini analysis failed, using fallback")
-                        
-                except Exception as e:
-                    print(f"Exception in enhanced analysis: {e}")
-                    # Fallback to static analysis if Gemini fails
-                    st.session_state.enhanced_analysis = {
-                        'analysis': f'Enhanced analysis error: {str(e)}',
-                        'confidence_score': 0.0,
-                        'educational_insight': 'Static educational content provided below.'
-                    }
-        
-        # Display enhanced analysis
-        analysis_col1, analysis_col2 = st.columns([1, 1])
-        
-        with analysis_col1:
-            st.markdown("#### 🔍 **AI-Powered Detailed Breakdown**")
-            
-            if st.session_state.enhanced_analysis and st.session_state.enhanced_analysis['confidence_score'] > 0:
-                # Parse Gemini response for detailed breakdown
-                analysis_text = st.session_state.enhanced_analysis['analysis']
-                if "DETAILED_BREAKDOWN:" in analysis_text:
-                    detailed_part = analysis_text.split("DETAILED_BREAKDOWN:")[1].split("EDUCATIONAL_INSIGHTS:")[0].strip()
-                    st.markdown(detailed_part)
-                else:
-                    st.markdown(analysis_text[:500] + "..." if len(analysis_text) > 500 else analysis_text)
-            else:
-                # Fallback static analysis
-                if st.session_state.result == 1:
-                    st.markdown("""
-                    **🚨 Potential Red Flags Detected:**
-                    - Language patterns consistent with misinformation
-                    - Statistical model confidence indicates suspicious content
-                    - Recommend fact-checking with reliable sources
-                    
-                    **⚠️ Warning Signs:**
-                    - Emotional or sensational language
-                    - Lack of credible source citations
-                    - Unusual writing patterns
-                    """)
-                else:
-                    st.markdown("""
-                    **✅ Credibility Indicators Found:**
-                    - Language patterns align with legitimate news
-                    - Statistical model shows high authenticity confidence
-                    - Content structure follows journalistic standards
-                    
-                    **📊 Positive Signs:**
-                    - Balanced and factual tone
-                    - Coherent narrative structure
-                    - Professional writing style
-                    """)
-        
-        with analysis_col2:
-            st.markdown("#### 🎓 **AI-Generated Educational Insights**")
-            
-            if st.session_state.enhanced_analysis and st.session_state.enhanced_analysis['confidence_score'] > 0:
-                # Parse Gemini response for educational insights
-                analysis_text = st.session_state.enhanced_analysis['analysis']
-                if "EDUCATIONAL_INSIGHTS:" in analysis_text:
-                    education_part = analysis_text.split("EDUCATIONAL_INSIGHTS:")[1].split("CONTEXT_ANALYSIS:")[0].strip()
-                    st.markdown(education_part)
-                else:
-                    st.markdown(st.session_state.enhanced_analysis['educational_insight'])
-            else:
-                # Fallback static content
-                st.markdown("""
-                **How to Spot Fake News:**
-                - Check multiple reliable sources
-                - Look for author credentials
-                - Verify publication date and context
-                - Be wary of emotional headlines
-                - Cross-reference with fact-checkers
-                
-                **Trusted Sources:**
-                - Reuters, AP News, BBC
-                - Snopes, FactCheck.org
-                - Local newspaper websites
-                - Government official sources
-                """)
-        
-        # Context Analysis Section
-        if st.session_state.enhanced_analysis and st.session_state.enhanced_analysis['confidence_score'] > 0:
-            analysis_text = st.session_state.enhanced_analysis['analysis']
-            if "CONTEXT_ANALYSIS:" in analysis_text:
-                context_part = analysis_text.split("CONTEXT_ANALYSIS:")[1].strip()
-                if context_part:
-                    st.markdown("#### 🌐 **Contextual Guidance**")
-                    st.info(context_part)
-        
-        # Refresh analysis button
-        if st.button("🔄 Regenerate Enhanced Analysis", key="refresh_analysis"):
-            st.session_state.enhanced_analysis = None
-            st.rerun()
+        render_enhanced_analysis()
         
         # Professional Gemini Analysis Section
         st.markdown("---")
@@ -953,38 +490,50 @@ CONTEXT_ANALYSIS: What to look for in similar articles"""
         
         with gemini_col2:
             if st.button("🚀 **Analyze with Gemini AI**", key="professional_gemini_analysis", use_container_width=True):
-                with st.spinner("🧠 Running comprehensive AI analysis..."):
-                    if not st.session_state.user_input or len(st.session_state.user_input.strip()) < 10:
-                        st.warning("⚠️ Please enter at least 10 characters of text for Gemini analysis.")
-                    else:
-                        try:
-                            # Initialize Gemini Analyzer
-                            analyzer = GeminiAnalyzer()
-                            
-                            if hasattr(analyzer, 'is_configured') and analyzer.is_configured:
+                if st.session_state.get('input_words', 0) < MIN_ARTICLE_WORDS:
+                    st.warning(f"⚠️ Please enter at least {MIN_ARTICLE_WORDS} words of text for Gemini analysis.")
+                else:
+                    from gemini_integration import (
+                        _api_errors, _error_message, get_analyzer, display_gemini_results, partial_results_writer
+                    )
+                    
+                    try:
+                        # Shared Gemini Analyzer, built once per server with its model clients
+                        analyzer = get_analyzer()
+                        
+                        if hasattr(analyzer, 'is_configured') and analyzer.is_configured:
+                            # Reuse the combined call's analysis when it succeeded
+                            gemini_results = st.session_state.get('gemini_results')
+                            if not gemini_results or gemini_results.get('fallback'):
                                 # Get ML prediction context
-                                ml_prediction = "FAKE" if st.session_state.result == 1 else "REAL"
+                                ml_prediction = st.session_state.result_label
                                 
-                                # Run comprehensive analysis
+                                # Run comprehensive analysis, previewing fields as they stream in
+                                preview = st.empty()
+                                preview.caption("🔍 Running comprehensive analysis...")
                                 gemini_results = analyzer.analyze_text(
-                                    st.session_state.user_input, 
-                                    ml_prediction
+                                    st.session_state.article_excerpt,
+                                    ml_prediction,
+                                    on_partial=partial_results_writer(preview)
                                 )
-                                
-                                # Display professional results
-                                st.success("✅ **Comprehensive Analysis Complete**")
-                                display_gemini_results(gemini_results)
-                                
-                            else:
-                                st.warning("⚠️ **Gemini API Configuration Issue**")
-                                st.info("Please check your API key configuration. The core ML analysis is still working perfectly!")
-                                
-                        except Exception as e:
-                            st.error(f"⚠️ **Analysis Error**: {str(e)}")
-                            st.info("The core fake news detection system continues to work perfectly. This is just an additional feature.")
+                                preview.empty()
+                            
+                            # Display professional results
+                            st.success("✅ **Comprehensive Analysis Complete**")
+                            display_gemini_results(gemini_results)
+                            
+                        else:
+                            st.warning("⚠️ **Gemini API Configuration Issue**")
+                            st.info("Please check your API key configuration. The core ML analysis is still working perfectly!")
+                            
+                    except _api_errors() as e:
+                        st.error(f"⚠️ **Analysis Error**: {_error_message(e)}")
+                        st.info("The core fake news detection system continues to work perfectly. This is just an additional feature.")
     
-    elif check_button and not user_input.strip():
+    elif check_button and word_count == 0:
         st.warning("⚠️ Please enter some text to analyze!")
+    elif too_short:
+        st.warning(f"⚠️ Article too short for reliable analysis. Please paste at least {MIN_ARTICLE_WORDS} words.")
     
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -993,25 +542,6 @@ if __name__ == "__main__":
     main()
     
     # Modern Footer
-    st.markdown("""
-    <div style="
-        margin-top: 4rem;
-        padding: 2rem;
-        text-align: center;
-        background: rgba(255, 255, 255, 0.05);
-        border-top: 1px solid rgba(0, 212, 255, 0.2);
-        border-radius: 20px 20px 0 0;
-    ">
-        <p style="
-            color: var(--light-blue);
-            font-size: 0.9rem;
-            margin: 0;
-        ">
-            🚀 <strong>Created with enthusiasm by hacktreet team</strong> | 
-            Powered by TRUTH-AI Technology | 
-            🛡️ Protecting truth in the digital age
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(FOOTER_HTML, unsafe_allow_html=True)
 
 ##run with command streamlit run main.py --client.showErrorDetails=false to remove cache error message on streamlit interface
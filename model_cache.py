@@ -0,0 +1,200 @@
+"""
+TRUTH-AI - Model Cache
+Fits the fake news detection models and persists them with joblib so cold starts skip training
+"""
+
+import os
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from joblib import Parallel, delayed
+from scipy.special import expit
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, HashingVectorizer, TfidfTransformer
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.pipeline import Pipeline
+from sklearn.svm import LinearSVC
+
+
+DATA_PATH = "fake_or_real_news.csv"
+CACHE_DIR = "cache"
+# Bump whenever the fitted pipeline changes so stale artifacts are rebuilt instead of loaded
+CACHE_VERSION = 6
+# Close to the ~62k-term vocabulary the corpus had before hashing. Naive Bayes smooths every
+# column, including empty buckets, so a much wider space dilutes its estimates and costs accuracy.
+N_FEATURES = 2 ** 16
+
+VECTORIZER_TYPES = ["TF-IDF", "Bag of Words"]
+CLASSIFIER_TYPES = ["Linear SVM", "Naive Bayes"]
+
+Models = Dict[Tuple[str, str], tuple]
+
+# sklearn's default token pattern, bound once
+_find_tokens = re.compile(r"(?u)\b\w\w+\b").findall
+
+
+def load_dataset(path: str = DATA_PATH) -> pd.DataFrame:
+    """
+    Read the labelled articles and add the binary `fake` target (0 for real, 1 for fake)
+    """
+    # Only the columns the models use; the C engine because articles contain quoted newlines
+    data = pd.read_csv(path, usecols=['text', 'label'], dtype={'label': 'category'})
+    # On the categorical label this compares integer codes, not one string per row
+    data['fake'] = data['label'].ne('REAL').to_numpy(dtype=np.uint8)
+    return data
+
+
+def analyze_document(doc: str) -> List[str]:
+    """
+    Lowercase, tokenize and drop English stop words in one pass, matching sklearn's
+    default word analyzer without its closure chain. Module-level so models pickle.
+    """
+    return [token for token in _find_tokens(doc.lower()) if token not in ENGLISH_STOP_WORDS]
+
+
+def _cache_path(vectorizer_type: str) -> str:
+    slug = vectorizer_type.lower().replace(" ", "_")
+    return os.path.join(CACHE_DIR, f"{slug}.v{CACHE_VERSION}.joblib")
+
+
+def _hash_documents(hasher, texts: np.ndarray):
+    """
+    Tokenize and hash documents across processes. The hasher is stateless, so the
+    per-shard matrices simply stack with no vocabulary merge.
+    """
+    shards = [shard for shard in np.array_split(texts, os.cpu_count() or 1) if len(shard)]
+    if len(shards) == 1:
+        return hasher.transform(texts)
+    parts = Parallel(n_jobs=len(shards))(delayed(hasher.transform)(shard) for shard in shards)
+    return sp.vstack(parts, format='csr')
+
+
+def build_models(data: pd.DataFrame, vectorizer_type: str) -> Models:
+    """
+    Fit one vectorizer, train every classifier on its features and persist the result
+    """
+    # Hashing keeps no vocabulary dict: features are murmurhash buckets, so transform is O(tokens)
+    # float32 halves the training matrix and the bytes moved through the sparse dot products
+    hasher = HashingVectorizer(n_features=N_FEATURES, alternate_sign=False, analyzer=analyze_document, norm=None,
+                               dtype=np.float32)
+    vectorizer = None
+    if vectorizer_type == "TF-IDF":
+        vectorizer = Pipeline([("hash", hasher), ("tfidf", TfidfTransformer())])
+    elif vectorizer_type == "Bag of Words":
+        vectorizer = hasher
+
+    # Plain arrays spare sklearn the pandas Series iteration and validation
+    texts = data['text'].to_numpy()
+    labels = data['fake'].to_numpy()
+    x_vectorized = _hash_documents(hasher, texts)
+    if vectorizer is not hasher:
+        x_vectorized = vectorizer.named_steps["tfidf"].fit_transform(x_vectorized)
+
+    models = {}
+    for classifier_type in CLASSIFIER_TYPES:
+        classifier = None
+        if classifier_type == "Linear SVM":
+            # Sigmoid calibration gives the SVM real probabilities to report as confidence
+            classifier = CalibratedClassifierCV(LinearSVC(dual='auto'), cv=3, method='sigmoid')
+        elif classifier_type == "Naive Bayes":
+            classifier = MultinomialNB()
+
+        classifier.fit(x_vectorized, labels)
+        models[(vectorizer_type, classifier_type)] = (vectorizer, classifier)
+
+    # Uncompressed so numpy arrays can be memory-mapped on load; rename for an atomic publish
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = _cache_path(vectorizer_type)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    joblib.dump(models, tmp_path, compress=0)
+    os.replace(tmp_path, path)
+    return models
+
+
+def load_models(vectorizer_type: str) -> Optional[Models]:
+    """
+    Load persisted models for a vectorizer, None when they are missing or unreadable
+    """
+    path = _cache_path(vectorizer_type)
+    if not os.path.exists(path):
+        return None
+    try:
+        return joblib.load(path, mmap_mode='r')
+    except Exception as e:
+        print(f"⚠️ Ignoring unreadable model cache {path}: {e}")
+        return None
+
+
+def make_transform(vectorizer) -> Callable[[str], object]:
+    """
+    Build a single-document equivalent of `vectorizer.transform([text])`.
+
+    For the TF-IDF pipeline the idf weights are gathered straight into the hashed counts,
+    instead of TfidfTransformer's sparse diagonal matmul and the CSR copy it makes.
+    """
+    if not isinstance(vectorizer, Pipeline):
+        return lambda text: vectorizer.transform([text])
+
+    hasher = vectorizer.named_steps["hash"]
+    tfidf = vectorizer.named_steps["tfidf"]
+    idf = np.asarray(tfidf.idf_, dtype=np.float32)
+
+    def transform(text: str):
+        X = hasher.transform([text])
+        if tfidf.sublinear_tf:
+            np.log(X.data, out=X.data)
+            X.data += 1
+        np.multiply(X.data, idf.take(X.indices), out=X.data)
+        if tfidf.norm == 'l2':
+            norm = np.sqrt(X.data @ X.data)
+            if norm:
+                X.data /= norm
+        return X
+
+    return transform
+
+
+def make_predictor(classifier) -> Callable[[object], float]:
+    """
+    Build a single-document equivalent of `classifier.predict_proba(x)[0, 1]` (probability of fake).
+
+    Both classifiers reduce to linear scores over the nonzero features, so prediction is a
+    float32 gather-dot that skips sklearn's per-call input validation.
+    """
+    if isinstance(classifier, MultinomialNB):
+        # Two-class NB posterior is the sigmoid of the log-likelihood ratio
+        log_prob = classifier.feature_log_prob_
+        w = (log_prob[1] - log_prob[0]).astype(np.float32)
+        b = float(classifier.class_log_prior_[1] - classifier.class_log_prior_[0])
+        return lambda x: float(expit(w.take(x.indices) @ x.data + b))
+
+    # Calibrated SVM averages one sigmoid-calibrated LinearSVC per CV fold
+    folds = classifier.calibrated_classifiers_
+    W = np.vstack([fold.estimator.coef_[0] for fold in folds]).astype(np.float32)
+    B = np.array([fold.estimator.intercept_[0] for fold in folds])
+    A = np.array([fold.calibrators[0].a_ for fold in folds])
+    C = np.array([fold.calibrators[0].b_ for fold in folds])
+
+    def predict(x) -> float:
+        scores = W.take(x.indices, axis=1) @ x.data + B
+        return float(expit(-(A * scores + C)).mean())
+
+    return predict
+
+
+def get_or_build(vectorizer_type: str, load_data: Callable[[], pd.DataFrame] = load_dataset) -> Models:
+    models = load_models(vectorizer_type)
+    if models is None:
+        models = build_models(load_data(), vectorizer_type)
+    return models
+
+
+# Build step: `python model_cache.py` pre-fits every model so the app never trains at runtime
+if __name__ == "__main__":
+    for vectorizer_type in VECTORIZER_TYPES:
+        get_or_build(vectorizer_type)
+        print(f"✅ Cached models for {vectorizer_type} in {_cache_path(vectorizer_type)}")